@@ -14,68 +14,89 @@ from __future__ import annotations
 
 import argparse
 import json
+import mmap
 import re
 import sys
 from pathlib import Path
 from typing import Any
 
-import gmpy2
+import primes
+
+# On-disk cache of n -> nth prime, shared across script runs so
+# regenerating a checkpoint for the same n never re-sieves.
+PRIME_CACHE_FILE = Path("prime_cache.json")
 
 
 def compute_nth_prime(n: int) -> int:
-    """Get the nth prime (1-indexed)."""
-    if n < 1:
-        return 2
-    p = 2
-    for _ in range(n - 1):
-        p = int(gmpy2.next_prime(p))
+    """Get the nth prime (1-indexed), cached on disk across runs."""
+    cache: dict[str, int] = {}
+    if PRIME_CACHE_FILE.exists():
+        try:
+            cache = json.loads(PRIME_CACHE_FILE.read_text())
+        except (json.JSONDecodeError, OSError):
+            cache = {}
+
+    key = str(n)
+    if key in cache:
+        return cache[key]
+
+    p = primes.nth_prime(n)
+    cache[key] = p
+    try:
+        PRIME_CACHE_FILE.write_text(json.dumps(cache, indent=2))
+    except OSError:
+        pass  # Cache is best-effort
     return p
 
 
+# Header line: "Computing F(4610) with..."
+HEADER_PAT = re.compile(rb'F\((\d+)\)')
+
+# Combined tail pattern, compiled once. Alternation matches either the
+# confirmed-offset marker "[73951; ?]" or a line-terminal elapsed time
+# like "(85.39m)" / "(5.24s)"; one C-level pass finds both.
+TAIL_PAT = re.compile(
+    rb'\[(?P<confirmed>\d+); \?\]|\((?P<value>\d+\.?\d*)(?P<unit>[ms])\)[ \t\r]*$',
+    re.MULTILINE,
+)
+
+# Only the tail of the log can hold the latest state; 64 KiB covers
+# hundreds of batch lines even at the widest worker counts.
+TAIL_WINDOW = 65536
+
+
 def parse_log(log_path: Path) -> dict[str, Any]:
     """Parse v2 log to extract current state."""
-    with open(log_path) as f:
-        lines = f.readlines()
-    
-    # Extract n from header or first log line
-    # Format: "Computing F(4610) with..."
-    n = None
-    for line in lines[:5]:
-        match = re.search(r'F\((\d+)\)', line)
-        if match:
-            n = int(match.group(1))
-            break
-    
-    if n is None:
-        raise ValueError("Could not determine n from log file")
-    
-    # Find the latest confirmed offset
-    # Format: "F(4610) W15 : [73951; ?]" - the number in brackets is confirmed_up_to
-    confirmed_up_to = None
-    elapsed_time = None
-    
-    for line in reversed(lines):
-        # Match pattern like [73951; ?]
-        match = re.search(r'\[(\d+); \?\]', line)
-        if match and confirmed_up_to is None:
-            confirmed_up_to = int(match.group(1))
-        
-        # Match elapsed time like (85.39m) or (5.24s)
-        time_match = re.search(r'\((\d+\.?\d*)([ms])\)\s*$', line.strip())
-        if time_match and elapsed_time is None:
-            value = float(time_match.group(1))
-            unit = time_match.group(2)
-            if unit == 'm':
-                elapsed_time = value * 60
+    with open(log_path, 'rb') as f:
+        size = log_path.stat().st_size
+        if size == 0:
+            raise ValueError("Could not determine n from log file")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Extract n from the header block
+        match = HEADER_PAT.search(mm, 0, 1024)
+        if match is None:
+            raise ValueError("Could not determine n from log file")
+        n = int(match.group(1))
+
+        # Scan only the tail for the latest confirmed offset and elapsed
+        # time, keeping the last match of each kind. A forward finditer
+        # over mmap'd bytes replaces the line-by-line reverse Python loop.
+        confirmed_up_to = None
+        elapsed_time = None
+
+        for m in TAIL_PAT.finditer(mm, max(0, size - TAIL_WINDOW)):
+            if m.group('confirmed') is not None:
+                confirmed_up_to = int(m.group('confirmed'))
             else:
-                elapsed_time = value
-        
-        if confirmed_up_to is not None and elapsed_time is not None:
-            break
-    
+                value = float(m.group('value'))
+                elapsed_time = value * 60 if m.group('unit') == b'm' else value
+
+        mm.close()
+
     if confirmed_up_to is None:
         raise ValueError("Could not determine confirmed_up_to from log file")
-    
+
     return {
         "n": n,
         "confirmed_up_to": confirmed_up_to,
@@ -0,0 +1,195 @@
+"""
+Fortunate Numbers Calculator - batch edition.
+
+Round-based parallel search: the offset range is split into fixed-size
+batches and each round dispatches one batch per worker via Pool.map.
+The primorial is computed once in the parent and shared with workers
+through the Pool initializer (copy-on-write under fork), so workers are
+bound purely by `is_prime`.
+
+Usage:
+    python fortunate.py 500          # Compute F(500)
+    python fortunate.py 500 510      # Compute F(500)..F(510)
+
+References:
+- OEIS A005235: https://oeis.org/A005235
+- Fortune's conjecture: All Fortunate numbers are prime
+"""
+
+import gmpy2
+import threading
+from multiprocessing import Pool, cpu_count
+from typing import Dict, Iterator, Optional, Tuple
+import sys
+import time
+
+from sieve_candidates import filter_batch
+import primes
+
+
+# =============================================================================
+# Helper Functions
+# =============================================================================
+
+def compute_nth_prime(n: int) -> int:
+    """Get the nth prime (1-indexed)."""
+    return primes.nth_prime(n)
+
+
+def compute_primorial(n: int) -> int:
+    """Compute primorial(n) = product of first n primes."""
+    return primes.primorial(n)
+
+
+# =============================================================================
+# Worker
+# =============================================================================
+
+# Primorial shared with workers via Pool initializer. Under fork the
+# parent's bignum is inherited copy-on-write, so no per-batch rebuild
+# and no serialization cost. _pn_z is the same value as an mpz so the
+# hot loop's `_pn_z + m` stays inside GMP instead of doing a CPython
+# bignum add and an int->mpz conversion per candidate.
+_pn: int = 0
+_pn_z = gmpy2.mpz(0)
+_n: int = 0
+
+
+def _init_worker(pn: int, n: int) -> None:
+    """Pool initializer: stash the precomputed primorial in module state."""
+    global _pn, _pn_z, _n
+    _pn = pn
+    _pn_z = gmpy2.mpz(pn)
+    _n = n
+
+
+def test_batch(args: Tuple[int, int]) -> Tuple[int, Optional[int]]:
+    """
+    Test one batch of candidate offsets against the shared primorial.
+
+    Offsets sharing a small factor with the primorial are rejected by
+    the wheel prefilter before the primality test sees anything. BPSW
+    (strong base-2 Fermat + strong Lucas) replaces 25 Miller-Rabin
+    rounds: no BPSW pseudoprime is known, and each avoided round is a
+    modular exponentiation on a number with thousands of digits.
+    Returns (start, m) where m is the smallest surviving offset in
+    [start, start + batch_size) making primorial + m prime, or
+    (start, None) if the batch has no prime. The start echoes back so
+    the orchestrator can match unordered results to batches.
+    """
+    start, batch_size = args
+    for m in filter_batch(start, start + batch_size, _n, _pn):
+        if gmpy2.is_bpsw_prp(_pn_z + m):
+            return start, m
+    return start, None
+
+
+# =============================================================================
+# Search
+# =============================================================================
+
+def fortunate_batch(
+    n: int,
+    batch_size: int = 50,
+    num_workers: Optional[int] = None,
+    verbose: bool = True,
+) -> int:
+    """
+    Find Fortunate number F(n) = smallest m > 1 where primorial(n) + m is prime.
+
+    Streams batches to a worker pool via imap_unordered, so no round
+    barrier: a slow batch never stalls dispatch of the next one. The
+    primorial is computed once here and handed to workers through the
+    pool initializer. Because results arrive out of order, a hit is only
+    accepted as F(n) once every batch below it has completed — a
+    contiguous watermark over finished batches guards minimality.
+    """
+    if num_workers is None:
+        num_workers = cpu_count()
+
+    start_time = time.time()
+    pn = compute_primorial(n)
+    start = compute_nth_prime(n + 1)  # F(n) >= p_{n+1} (Firoozbakht)
+
+    if verbose:
+        print(f"F({n}): searching from offset {start}, "
+              f"{num_workers} workers x {batch_size} candidates/batch")
+
+    # Set once a hit is found; stops the batch generator (which runs in
+    # the pool's task-handler thread) from dispatching further work.
+    stop = threading.Event()
+
+    # Back-pressure: cap batches in flight so the task-handler thread
+    # can't race arbitrarily far ahead of the workers. 4x workers keeps
+    # everyone busy without piling up dispatched-but-unstarted work.
+    in_flight = threading.BoundedSemaphore(4 * num_workers)
+
+    def batches() -> Iterator[Tuple[int, int]]:
+        s = start
+        while not stop.is_set():
+            # Timed acquire so a stop during a full pipeline is noticed
+            if not in_flight.acquire(timeout=0.1):
+                continue
+            if stop.is_set():
+                break
+            yield (s, batch_size)
+            s += batch_size
+
+    best_hit: Optional[int] = None
+    completed: Dict[int, int] = {}  # finished batch start -> end
+    completed_up_to = start  # all offsets below this are exhausted
+    next_report = start + num_workers * batch_size
+
+    with Pool(num_workers, initializer=_init_worker, initargs=(pn, n)) as pool:
+        for batch_start, m in pool.imap_unordered(test_batch, batches()):
+            in_flight.release()
+            if m is not None and (best_hit is None or m < best_hit):
+                best_hit = m
+                stop.set()
+
+            # Advance the contiguous watermark over completed batches
+            completed[batch_start] = batch_start + batch_size
+            while completed_up_to in completed:
+                completed_up_to = completed.pop(completed_up_to)
+
+            if best_hit is not None and completed_up_to > best_hit:
+                # Everything below the hit is exhausted: it's minimal.
+                if verbose:
+                    elapsed = time.time() - start_time
+                    print(f"F({n}) = {best_hit} ({elapsed:.2f}s)")
+                pool.terminate()
+                return best_hit
+
+            if verbose and best_hit is None and completed_up_to >= next_report:
+                print(f"F({n}): no prime below {completed_up_to}, continuing...")
+                next_report = completed_up_to + num_workers * batch_size
+
+    raise RuntimeError(f"F({n}) search ended without a result")  # unreachable
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> None:
+    """Command-line interface."""
+    if len(sys.argv) < 2:
+        print("Usage: python fortunate.py <start_n> [end_n] [batch_size]")
+        print("Example: python fortunate.py 500")
+        print("         python fortunate.py 500 510")
+        sys.exit(1)
+
+    start_n = int(sys.argv[1])
+    end_n = int(sys.argv[2]) if len(sys.argv) > 2 else start_n
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    total_start = time.time()
+    for n in range(start_n, end_n + 1):
+        fortunate_batch(n, batch_size=batch_size)
+
+    total = time.time() - total_start
+    print(f"\nCompleted {end_n - start_n + 1} computations in {total:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,16 +32,32 @@ References:
 """
 
 import gmpy2
-from multiprocessing import Process, Queue, cpu_count
-from dataclasses import dataclass, asdict
+import primes
+import struct
+from multiprocessing import Pipe, Process, cpu_count
+from sieve_candidates import filter_batch, warm_prefilter
+from multiprocessing.connection import Connection, wait as connection_wait
+from dataclasses import dataclass
 from typing import Optional, Dict, List, Tuple, Deque, Any
 from collections import deque
 from pathlib import Path
+import bisect
+import heapq
+import os
 import signal
 import json
 import sys
+import threading
 import time
 
+try:
+    # Rust-backed JSON parser, ~5-10x faster than stdlib json. Snapshots
+    # are written in the binary FEXP1 format now, so this only speeds up
+    # load()'s fallback read path for legacy JSON checkpoints.
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # =============================================================================
 # Configuration
@@ -55,6 +71,48 @@ BATCH_GROW_FACTOR = 1.5      # Grow factor when too fast
 BATCH_SHRINK_FACTOR = 0.7    # Shrink factor when too slow
 CHECKPOINT_FILE = "expedition_checkpoint.json"
 
+# Fixed-width IPC frames over per-worker pipes: no pickle, no Queue lock
+# or feeder thread. A task message is a chunk of (n, start, end) entries
+# so small batches don't pay one pipe round-trip each: a count header
+# followed by that many entries, count 0 being the poison pill. Workers
+# answer with one (worker_id, n, start, end, found_m, elapsed) frame per
+# entry - per-range results keep the completion watermark fine-grained -
+# with found_m = -1 when the batch held no prime.
+TASK_HEADER = struct.Struct("<i")
+TASK_FRAME = struct.Struct("<iqq")
+RESULT_FRAME = struct.Struct("<iiqqqd")
+POISON_N = -1
+NO_PRIME = -1
+
+# Aim for roughly this many candidates per task message; with small
+# adaptive batch sizes several batches share one send, with large ones
+# the chunk degenerates to a single batch.
+CHUNK_TARGET = 400
+
+# Journaled checkpointing: every batch outcome appends one fixed-width
+# record (n, start, end, found_m) to a journal; the full JSON snapshot
+# is only written every so many events or seconds, and load() replays
+# the journal on top of the snapshot. Replay is idempotent, so records
+# already covered by the snapshot fold in as no-ops.
+JOURNAL_FRAME = struct.Struct("<iqqq")
+JOURNAL_SNAPSHOT_EVENTS = 500   # Full snapshot at least every N events
+JOURNAL_SNAPSHOT_SECS = 60.0    # ... or every T seconds
+JOURNAL_FLUSH_EVERY = 64        # Push journal records to the OS every N
+
+# Binary snapshot format: magic + fixed header + length-prefixed
+# sections. Everything in the state is ints, floats and int pairs, so
+# struct packing beats JSON by several times in both size and speed.
+# Checkpoints fabricated by other tools stay JSON; load() sniffs the
+# magic and falls back.
+SNAPSHOT_MAGIC = b"FEXP1"
+SNAP_HEADER = struct.Struct("<iiid")   # start_n, end_n, batch_size, elapsed
+SNAP_COUNT = struct.Struct("<I")
+SNAP_RESULT = struct.Struct("<iq")     # n, F(n)
+SNAP_TIME = struct.Struct("<id")       # n, seconds
+SNAP_FLOAT = struct.Struct("<d")
+SNAP_SEARCH = struct.Struct("<iqqqqB")  # n, p_n+1, next, done_to, best, completed
+SNAP_RANGE = struct.Struct("<qq")
+
 
 # =============================================================================
 # Data Structures
@@ -67,17 +125,29 @@ class SearchState:
     p_n_plus_1: int           # Starting offset (Firoozbakht optimization)
     next_offset: int          # Next unassigned offset
     completed_up_to: int      # All offsets below this have been searched
-    pending_ranges: List[Tuple[int, int]]  # Ranges in flight (start, end)
+    pending_ranges: List[Tuple[int, int]]  # In-flight (start, end), kept sorted
     best_candidate: Optional[int] = None  # Best prime found so far
     completed: bool = False
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
-    
+        # Flat dict by hand: asdict() recursively deep-copies every
+        # field, which doubles memory for the pending_ranges list and
+        # bignum offsets on every checkpoint.
+        return {
+            "n": self.n,
+            "p_n_plus_1": self.p_n_plus_1,
+            "next_offset": self.next_offset,
+            "completed_up_to": self.completed_up_to,
+            "pending_ranges": self.pending_ranges,
+            "best_candidate": self.best_candidate,
+            "completed": self.completed,
+        }
+
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "SearchState":
-        # JSON deserializes tuples as lists - convert back
-        d["pending_ranges"] = [tuple(r) for r in d.get("pending_ranges", [])]
+        # JSON deserializes tuples as lists - convert back. Sort in
+        # case the source (e.g. a fabricated checkpoint) wasn't.
+        d["pending_ranges"] = sorted(tuple(r) for r in d.get("pending_ranges", []))
         return cls(**d)
 
 
@@ -129,6 +199,130 @@ class ExpeditionState:
         )
 
 
+def apply_batch_result(
+    state: ExpeditionState, n: int, start: int, end: int,
+    found_m: Optional[int],
+) -> bool:
+    """
+    Fold one batch outcome into the expedition state.
+
+    Shared between live result processing and journal replay on load,
+    and idempotent: re-applying an outcome the state already reflects
+    changes nothing. Returns True when this outcome finalizes F(n).
+    """
+    if n in state.results:
+        return False
+    search = state.searches[n]
+
+    # pending_ranges is kept sorted by start, so removal is a bisect
+    # instead of a scan and the lowest pending start is element 0
+    idx = bisect.bisect_left(search.pending_ranges, (start, end))
+    if (idx < len(search.pending_ranges)
+            and search.pending_ranges[idx] == (start, end)):
+        search.pending_ranges.pop(idx)
+    # else: already folded in (duplicate or replayed record)
+
+    if not search.pending_ranges:
+        search.completed_up_to = search.next_offset
+    else:
+        search.completed_up_to = search.pending_ranges[0][0]
+
+    if found_m is not None:
+        if search.best_candidate is None or found_m < search.best_candidate:
+            search.best_candidate = found_m
+
+    # Complete once every offset below the candidate has been searched
+    if (search.best_candidate is not None
+            and search.completed_up_to >= search.best_candidate):
+        search.completed = True
+        search.pending_ranges = []
+        search.completed_up_to = search.next_offset
+        state.results[n] = search.best_candidate
+        state.result_times[n] = state.total_elapsed
+        return True
+    return False
+
+
+def serialize_state(state: ExpeditionState) -> bytearray:
+    """Pack the expedition state into the binary snapshot format.
+
+    Returns the working bytearray directly - the writer takes any
+    bytes-like object, so there's no point copying it into bytes.
+    """
+    out = bytearray(SNAPSHOT_MAGIC)
+    out += SNAP_HEADER.pack(
+        state.start_n, state.end_n,
+        state.current_batch_size, state.total_elapsed,
+    )
+    out += SNAP_COUNT.pack(len(state.results))
+    for n, f_n in state.results.items():
+        out += SNAP_RESULT.pack(n, f_n)
+    out += SNAP_COUNT.pack(len(state.result_times))
+    for n, secs in state.result_times.items():
+        out += SNAP_TIME.pack(n, secs)
+    out += SNAP_COUNT.pack(len(state.batch_times))
+    for t in state.batch_times:
+        out += SNAP_FLOAT.pack(t)
+    out += SNAP_COUNT.pack(len(state.searches))
+    for n, s in state.searches.items():
+        best = NO_PRIME if s.best_candidate is None else s.best_candidate
+        out += SNAP_SEARCH.pack(
+            n, s.p_n_plus_1, s.next_offset, s.completed_up_to,
+            best, 1 if s.completed else 0,
+        )
+        out += SNAP_COUNT.pack(len(s.pending_ranges))
+        for r_start, r_end in s.pending_ranges:
+            out += SNAP_RANGE.pack(r_start, r_end)
+    return out
+
+
+def deserialize_state(raw: bytes) -> ExpeditionState:
+    """Unpack a binary snapshot produced by serialize_state."""
+    off = len(SNAPSHOT_MAGIC)
+    start_n, end_n, batch_size, elapsed = SNAP_HEADER.unpack_from(raw, off)
+    off += SNAP_HEADER.size
+
+    def counted(item: struct.Struct) -> List[Tuple[Any, ...]]:
+        nonlocal off
+        (count,) = SNAP_COUNT.unpack_from(raw, off)
+        off += SNAP_COUNT.size
+        items = [item.unpack_from(raw, off + i * item.size) for i in range(count)]
+        off += count * item.size
+        return items
+
+    results = dict(counted(SNAP_RESULT))
+    result_times = dict(counted(SNAP_TIME))
+    batch_times = [t for (t,) in counted(SNAP_FLOAT)]
+
+    searches: Dict[int, SearchState] = {}
+    (n_searches,) = SNAP_COUNT.unpack_from(raw, off)
+    off += SNAP_COUNT.size
+    for _ in range(n_searches):
+        n, p_n1, next_off, done_to, best, completed = SNAP_SEARCH.unpack_from(raw, off)
+        off += SNAP_SEARCH.size
+        pending = [(s, e) for s, e in counted(SNAP_RANGE)]
+        searches[n] = SearchState(
+            n=n,
+            p_n_plus_1=p_n1,
+            next_offset=next_off,
+            completed_up_to=done_to,
+            pending_ranges=sorted(pending),
+            best_candidate=None if best == NO_PRIME else best,
+            completed=bool(completed),
+        )
+
+    return ExpeditionState(
+        start_n=start_n,
+        end_n=end_n,
+        results=results,
+        result_times=result_times,
+        searches=searches,
+        batch_times=batch_times,
+        current_batch_size=batch_size,
+        total_elapsed=elapsed,
+    )
+
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
@@ -149,24 +343,27 @@ def format_duration(seconds: float) -> str:
 
 def compute_nth_prime(n: int) -> int:
     """Get the nth prime (1-indexed)."""
-    if n < 1:
-        return 2
-    p = 2
-    for _ in range(n - 1):
-        p = int(gmpy2.next_prime(p))
-    return p
+    return primes.nth_prime(n)
 
 
 def compute_primorial(n: int) -> int:
     """Compute primorial(n) = product of first n primes."""
-    if n == 0:
-        return 1
-    result = 1
-    p = 2
-    for _ in range(n):
-        result *= p
-        p = int(gmpy2.next_prime(p))
-    return result
+    return primes.primorial(n)
+
+
+# Primorials precomputed in the orchestrator before workers fork. Under
+# fork the bignums are inherited copy-on-write, so every worker reads
+# the parent's copy instead of redoing seconds of multiplication per
+# process when it first sees a new n. Workers fall back to computing
+# locally for any n not precomputed (e.g. after a range extension).
+_primorial_cache: Dict[int, int] = {}
+
+
+def _get_primorial(n: int) -> int:
+    """Primorial(n) from the shared pre-fork cache, computed on miss."""
+    if n not in _primorial_cache:
+        _primorial_cache[n] = compute_primorial(n)
+    return _primorial_cache[n]
 
 
 # =============================================================================
@@ -175,7 +372,13 @@ def compute_primorial(n: int) -> int:
 
 class TableLogger:
     """Logs worker assignments to markdown table for real-time visualization."""
-    
+
+    # Rows to accumulate before forcing a flush. Flushing every row cost
+    # a syscall per batch; the table only needs to be fresh-ish, and
+    # checkpoint saves flush it explicitly anyway.
+    FLUSH_EVERY = 16
+    BUFFER_SIZE = 65536
+
     def __init__(
         self,
         filepath: Path,
@@ -186,14 +389,15 @@ class TableLogger:
     ):
         self.filepath = filepath
         self.num_workers = num_workers
-        
+        self._unflushed_rows = 0
+
         if resume and filepath.exists():
             # Resume: truncate at summary section and append
             self._truncate_at_summary()
-            self.file = open(filepath, 'a')
+            self.file = open(filepath, 'a', buffering=self.BUFFER_SIZE)
         else:
             # Fresh start: write header
-            self.file = open(filepath, 'w')
+            self.file = open(filepath, 'w', buffering=self.BUFFER_SIZE)
             self._write_header(start_n, end_n)
     
     def _truncate_at_summary(self) -> None:
@@ -232,18 +436,20 @@ class TableLogger:
         elapsed_str: str,
         n: int,
         f_n: int,
-        worker_tasks: Dict[int, Optional["WorkerTask"]],
+        worker_tasks: List[List["WorkerTask"]],
         finished_worker: Optional[int] = None,
     ) -> None:
         """Write a table row showing current worker assignments."""
         row = f"| {elapsed_str:>5} | {n} | {f_n} |"
-        
+
         for w in range(self.num_workers):
-            task = worker_tasks.get(w)
-            if task is None:
+            tasks = worker_tasks[w]
+            if not tasks:
                 cell = "—"
             else:
-                # Show n:offset (which F value and where in the search)
+                # Show n:offset of the batch the worker is on (oldest
+                # queued entry of its current chunk)
+                task = tasks[0]
                 cell = f"{task.n}:{task.start_offset}"
             
             # Bold the n value for the worker that just confirmed this result
@@ -253,8 +459,15 @@ class TableLogger:
             row += f" {cell:>5} |"
         
         self.file.write(row + "\n")
+        self._unflushed_rows += 1
+        if self._unflushed_rows >= self.FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        """Push buffered rows to disk (called at checkpoint boundaries)."""
         self.file.flush()
-    
+        self._unflushed_rows = 0
+
     def log_summary(self, results: Dict[int, int], total_time: float) -> None:
         """Write summary section."""
         self.file.write("\n## Results Summary\n\n")
@@ -265,7 +478,7 @@ class TableLogger:
         self.file.write("|---:|-----:|\n")
         for n in sorted(results.keys()):
             self.file.write(f"| {n} | {results[n]} |\n")
-        self.file.flush()
+        self.flush()
     
     def close(self) -> None:
         """Close the log file."""
@@ -278,55 +491,88 @@ class TableLogger:
 
 def worker_process(
     worker_id: int,
-    task_queue: "Queue[Optional[Tuple[int, int, int, int]]]",
-    result_queue: "Queue[Tuple[int, int, int, int, Optional[int], float]]",
+    task_conn: Connection,
+    result_conn: Connection,
 ) -> None:
     """
-    Worker: receives (worker_id, n, start, end), tests batch, returns result.
-    
-    Result tuple: (worker_id, n, start, end, found_m, elapsed)
-    
+    Worker: receives chunks of (n, start, end) entries, tests each
+    batch, returns one result frame per entry.
+
+    Result frame: (worker_id, n, start, end, found_m, elapsed)
+
     Workers just do the primality tests - the orchestrator handles
     early termination by not assigning more work for completed n values.
     """
     # Ignore signals in workers - only main process handles shutdown
     signal.signal(signal.SIGINT, signal.SIG_IGN)
     signal.signal(signal.SIGTERM, signal.SIG_IGN)
-    
-    # Cache primorials to avoid recomputation
-    primorial_cache: Dict[int, int] = {}
-    
-    while True:
+
+    # Pin to one core so the scheduler doesn't migrate us mid-run:
+    # the working set (primorial limbs, wheel mask) stays in that
+    # core's cache for the lifetime of the expedition.
+    if hasattr(os, "sched_setaffinity"):
         try:
-            task = task_queue.get(timeout=2.0)
-        except Exception:
-            continue  # Queue may be closing or timeout
-        
-        if task is None:  # Poison pill
-            break
-        
-        wid, n, start, end = task
-        
-        # Get or compute primorial
-        if n not in primorial_cache:
-            primorial_cache[n] = compute_primorial(n)
-        pn = primorial_cache[n]
-        
-        # Test batch - do the actual work!
-        start_time = time.time()
-        found_m: Optional[int] = None
-        
-        for m in range(start, end):
-            if gmpy2.is_prime(pn + m, 25):
-                found_m = m
-                break
-        
-        elapsed = time.time() - start_time
-        
+            os.sched_setaffinity(0, {worker_id % cpu_count()})
+        except OSError:
+            pass  # restricted affinity mask; run unpinned
+
+    # For most of a run every task targets the same n, so keep the last
+    # primorial in locals: the common case costs one int compare per
+    # task. When active searches interleave, switching n would redo the
+    # int->mpz conversion each time, so warm mpz copies are kept per n.
+    pn_z_cache: Dict[int, Any] = {}
+    last_n = -1
+    pn = 0
+    pn_z = gmpy2.mpz(0)
+
+    while True:
         try:
-            result_queue.put((wid, n, start, end, found_m, elapsed))
-        except (BrokenPipeError, ConnectionResetError, EOFError):
-            break  # Shutdown in progress
+            msg = task_conn.recv_bytes()
+        except (EOFError, OSError):
+            break  # Orchestrator went away
+
+        (count,) = TASK_HEADER.unpack_from(msg)
+        if count == 0:
+            break  # Poison pill
+
+        for i in range(count):
+            n, start, end = TASK_FRAME.unpack_from(
+                msg, TASK_HEADER.size + i * TASK_FRAME.size
+            )
+
+            if n != last_n:
+                # Primorial comes from the pre-fork cache (copy-on-write
+                # share of the parent's bignum), computed only on a miss.
+                # The mpz copy keeps `pn_z + m` inside GMP instead of a
+                # CPython bignum add plus a full conversion per candidate.
+                pn = _get_primorial(n)
+                pn_z = pn_z_cache.get(n)
+                if pn_z is None:
+                    pn_z = pn_z_cache[n] = gmpy2.mpz(pn)
+                last_n = n
+
+            # Test batch - do the actual work! The wheel prefilter
+            # rejects offsets sharing a small factor with primorial(n)
+            # before the primality test sees anything. BPSW (strong
+            # base-2 Fermat + strong Lucas) has no known pseudoprimes
+            # and costs a couple of modular exponentiations instead of
+            # 25+ Miller-Rabin rounds.
+            start_time = time.time()
+            found_m = NO_PRIME
+
+            for m in filter_batch(start, end, n, pn):
+                if gmpy2.is_bpsw_prp(pn_z + m):
+                    found_m = m
+                    break
+
+            elapsed = time.time() - start_time
+
+            try:
+                result_conn.send_bytes(
+                    RESULT_FRAME.pack(worker_id, n, start, end, found_m, elapsed)
+                )
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                return  # Shutdown in progress
 
 
 # =============================================================================
@@ -335,7 +581,7 @@ def worker_process(
 
 class BatchSizer:
     """Manages adaptive batch sizing based on timing feedback."""
-    
+
     def __init__(
         self,
         initial_size: int = 100,
@@ -344,17 +590,25 @@ class BatchSizer:
     ):
         self.current_size = initial_size
         self.target_time = target_time
-        self.times: Deque[float] = deque(maxlen=window_size)
-    
+        # EWMA over per-candidate time, smoothed like a moving average
+        # of window_size batches; one float replaces the deque that was
+        # serialized into every checkpoint.
+        self._alpha = 2.0 / (window_size + 1)
+        self._ewma: Optional[float] = None
+        self._samples = 0
+
     def record_batch(self, elapsed: float, batch_size: int) -> None:
         """Record a batch completion and adjust size."""
         # Normalize to per-candidate time
         time_per_candidate = elapsed / max(batch_size, 1)
-        self.times.append(time_per_candidate)
-        
-        if len(self.times) >= 3:  # Need some data
-            avg_time_per_candidate = sum(self.times) / len(self.times)
-            expected_batch_time = avg_time_per_candidate * self.current_size
+        if self._ewma is None:
+            self._ewma = time_per_candidate
+        else:
+            self._ewma += self._alpha * (time_per_candidate - self._ewma)
+        self._samples += 1
+
+        if self._samples >= 3:  # Need some data
+            expected_batch_time = self._ewma * self.current_size
             
             if expected_batch_time < self.target_time * 0.5:
                 # Too fast - grow
@@ -373,10 +627,15 @@ class BatchSizer:
         return self.current_size
     
     def get_times_list(self) -> List[float]:
-        return list(self.times)
-    
+        """Timing state for the checkpoint: at most one float now."""
+        return [] if self._ewma is None else [self._ewma]
+
     def load_times(self, times: List[float]) -> None:
-        self.times = deque(times, maxlen=BATCH_TIME_WINDOW)
+        # Old checkpoints carry a whole window of samples; fold them
+        # into the starting EWMA. New ones carry the EWMA itself.
+        if times:
+            self._ewma = sum(times) / len(times)
+            self._samples = len(times)
 
 
 # =============================================================================
@@ -384,36 +643,169 @@ class BatchSizer:
 # =============================================================================
 
 class CheckpointManager:
-    """Manages state persistence for resume capability."""
-    
+    """
+    Manages state persistence for resume capability.
+
+    Writes are handed off to a background thread so the orchestrator
+    never blocks on disk: save() serializes the snapshot and returns;
+    the writer chains write -> fsync -> atomic rename. Bursts coalesce -
+    only the most recent snapshot is flushed.
+
+    Between snapshots, per-batch outcomes go to an append-only journal
+    of fixed-width records. load() replays the journal on top of the
+    snapshot; because replay is idempotent, the journal can safely
+    overlap what the snapshot already contains. save() rotates the
+    current journal aside and the writer discards it once the snapshot
+    that supersedes it is durable.
+    """
+
     def __init__(self, filepath: Path):
         self.filepath = filepath
-    
+        self.journal_path = filepath.with_suffix(".journal")
+        self._old_journal_path = filepath.with_suffix(".journal.old")
+        self._journal: Optional[Any] = None
+        self._journal_unflushed = 0
+        self._cond = threading.Condition()
+        self._pending: Optional[bytes] = None
+        self._busy = False
+        self._writer: Optional[threading.Thread] = None
+
+    def append_event(
+        self, n: int, start: int, end: int, found_m: Optional[int]
+    ) -> None:
+        """Append one batch outcome to the journal (buffered)."""
+        if self._journal is None:
+            self._journal = open(self.journal_path, "ab")
+        self._journal.write(JOURNAL_FRAME.pack(
+            n, start, end, NO_PRIME if found_m is None else found_m
+        ))
+        self._journal_unflushed += 1
+        if self._journal_unflushed >= JOURNAL_FLUSH_EVERY:
+            self._journal.flush()
+            self._journal_unflushed = 0
+
+    def _rotate_journal(self) -> None:
+        """Set the journal aside; its events are in the queued snapshot."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+            self._journal_unflushed = 0
+        if self.journal_path.exists():
+            # Keep it until the superseding snapshot is durable; replay
+            # idempotency makes the overlap harmless if we crash first.
+            self.journal_path.rename(self._old_journal_path)
+
+    def _replay_journal(self, state: ExpeditionState, path: Path) -> None:
+        """Re-apply journaled batch outcomes on top of a snapshot."""
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            return
+        size = JOURNAL_FRAME.size
+        for off in range(0, len(raw) - len(raw) % size, size):
+            n, start, end, found_m = JOURNAL_FRAME.unpack_from(raw, off)
+            if n in state.searches:
+                apply_batch_result(
+                    state, n, start, end,
+                    None if found_m == NO_PRIME else found_m,
+                )
+
     def save(self, state: ExpeditionState) -> None:
-        """Save state to checkpoint file."""
+        """Queue a snapshot for writing (serializes here, writes async)."""
+        payload = serialize_state(state)
+        self._rotate_journal()
+        with self._cond:
+            self._pending = payload
+            if self._writer is None:
+                # Started lazily so the thread is created after worker
+                # processes fork (threads don't survive fork).
+                self._writer = threading.Thread(
+                    target=self._write_loop, daemon=True
+                )
+                self._writer.start()
+            self._cond.notify()
+
+    def flush(self) -> None:
+        """Block until any queued snapshot has reached disk."""
+        with self._cond:
+            while self._pending is not None or self._busy:
+                self._cond.wait()
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                payload = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                self._write_snapshot(payload)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write_snapshot(self, payload: bytes) -> None:
+        """Durable write: tmp file + fdatasync, then atomic rename.
+
+        Raw fd calls rather than a Python file object: no buffering
+        layer to allocate and flush for a payload that's written in one
+        piece anyway. The rename stays - journal rotation deletes the
+        old journal once its superseding snapshot is durable, so the
+        snapshot on disk must never be a half-written one.
+        """
         temp_path = self.filepath.with_suffix(".tmp")
-        with open(temp_path, "w") as f:
-            json.dump(state.to_dict(), f, indent=2)
-        temp_path.rename(self.filepath)  # Atomic rename
-    
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fdatasync(fd)
+            # The checkpoint is write-only from our side; tell the
+            # kernel to drop its pages so minute-by-minute snapshots
+            # don't evict warm state from the page cache.
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+        temp_path.rename(self.filepath)
+        # The snapshot covers everything the rotated journal recorded
+        if self._old_journal_path.exists():
+            self._old_journal_path.unlink()
+
     def load(self) -> Optional[ExpeditionState]:
-        """Load state from checkpoint file."""
+        """Load state from checkpoint file, replaying any journal."""
         if not self.filepath.exists():
             return None
         try:
-            with open(self.filepath, "r") as f:
-                data = json.load(f)
-            return ExpeditionState.from_dict(data)
-        except (json.JSONDecodeError, KeyError) as e:
+            raw = self.filepath.read_bytes()
+            if raw[:len(SNAPSHOT_MAGIC)] == SNAPSHOT_MAGIC:
+                state = deserialize_state(raw)
+            else:
+                # Hand-built / older checkpoints are JSON; keep reading them
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                state = ExpeditionState.from_dict(data)
+        except (ValueError, KeyError, struct.error) as e:
             print(f"Warning: Could not load checkpoint: {e}")
             return None
-    
+        # Oldest first: .old outlives its snapshot only when a crash
+        # beat the write that would have retired it
+        self._replay_journal(state, self._old_journal_path)
+        self._replay_journal(state, self.journal_path)
+        return state
+
     def exists(self) -> bool:
         return self.filepath.exists()
-    
+
     def remove(self) -> None:
-        if self.filepath.exists():
-            self.filepath.unlink()
+        self.flush()  # Don't let an in-flight write resurrect the file
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        for path in (self.filepath, self.journal_path, self._old_journal_path):
+            if path.exists():
+                path.unlink()
 
 
 # =============================================================================
@@ -475,26 +867,58 @@ class Expedition:
                 resume=actually_resuming
             )
         
-        # Runtime state (not checkpointed)
-        self.worker_tasks: Dict[int, Optional[WorkerTask]] = {
-            i: None for i in range(self.num_workers)
-        }
+        # Runtime state (not checkpointed). Each worker holds the chunk
+        # of batches currently queued on its pipe, oldest first. A flat
+        # list indexed by worker id - the ids are dense, and the scans
+        # below shouldn't hash every key just to walk N slots.
+        self.worker_tasks: List[List[WorkerTask]] = [
+            [] for _ in range(self.num_workers)
+        ]
         self.start_time = time.time()
         self.baseline_elapsed = self.state.total_elapsed  # Time from previous sessions
         self.shutdown_requested = False
+
+        # Snapshot cadence: full saves happen on finalization, every
+        # JOURNAL_SNAPSHOT_EVENTS batches, or every JOURNAL_SNAPSHOT_SECS
+        self._events_since_snapshot = 0
+        self._last_snapshot = time.time()
         
-        # Queues
-        self.task_queue: "Queue[Optional[Tuple[int, int, int, int]]]" = Queue()
-        self.result_queue: "Queue[Tuple[int, int, int, int, Optional[int], float]]" = Queue()
-        
+        # Dispatch bookkeeping: a heap of (next_offset, n) for searches
+        # that still have fresh ranges to hand out (one live entry per
+        # n, stale entries skipped lazily), and a deque of orphaned
+        # ranges - in flight when a previous run died, or abandoned by
+        # a worker that vanished - that get re-dispatched first.
+        self._active_heap: List[Tuple[int, int]] = []
+        self._orphans: Deque[Tuple[int, int, int]] = deque()
+        for n, search in self.state.searches.items():
+            if n in self.state.results or search.completed:
+                continue
+            heapq.heappush(self._active_heap, (search.next_offset, n))
+            for r_start, r_end in search.pending_ranges:
+                self._orphans.append((n, r_start, r_end))
+
+        # Per-worker pipes, created when workers start
+        self.task_conns: List[Connection] = []
+        self.result_conns: List[Connection] = []
+        self._dead_workers: set[int] = set()
+
+        # Self-pipe: the signal handler writes one byte so a shutdown
+        # interrupts the blocking wait on result pipes immediately
+        # instead of after a polling timeout
+        self._wakeup_r, self._wakeup_w = Pipe(duplex=False)
+
         # Workers
         self.workers: List[Process] = []
     
     def _create_initial_state(self) -> ExpeditionState:
         """Create fresh expedition state."""
+        # One sieve call covers every p_{n+1} the range needs; indexing
+        # the returned list replaces a cache lookup per n
+        range_primes = primes.first_n_primes(self.end_n + 1)
+
         searches: Dict[int, SearchState] = {}
         for n in range(self.start_n, self.end_n + 1):
-            p_n_plus_1 = compute_nth_prime(n + 1)
+            p_n_plus_1 = range_primes[n]  # 0-based list: p_{n+1}
             searches[n] = SearchState(
                 n=n,
                 p_n_plus_1=p_n_plus_1,
@@ -520,24 +944,47 @@ class Expedition:
             if not self.shutdown_requested:  # Only print once
                 print(f"\n[Signal {signum}] Saving checkpoint and shutting down...")
             self.shutdown_requested = True
-        
+            try:
+                self._wakeup_w.send_bytes(b"\x00")  # Interrupt the wait
+            except (BrokenPipeError, OSError):
+                pass
+
         signal.signal(signal.SIGINT, handle_signal)
         signal.signal(signal.SIGTERM, handle_signal)
     
     def _start_workers(self) -> None:
-        """Start worker processes."""
+        """Start worker processes with dedicated task/result pipes."""
+        # Precompute primorials and prefilter tables for every
+        # unfinished n BEFORE forking so all workers inherit them
+        # copy-on-write instead of each redoing the multiplication,
+        # the trial-depth sieve and the pn mod q reductions on first
+        # contact with a new n.
+        for n in range(self.state.start_n, self.state.end_n + 1):
+            if n not in self.state.results:
+                warm_prefilter(n, _get_primorial(n))
+
         for i in range(self.num_workers):
+            task_r, task_w = Pipe(duplex=False)
+            result_r, result_w = Pipe(duplex=False)
             p = Process(
                 target=worker_process,
-                args=(i, self.task_queue, self.result_queue)
+                args=(i, task_r, result_w)
             )
             p.start()
+            # Close the child's ends in the parent so EOF propagates
+            task_r.close()
+            result_w.close()
+            self.task_conns.append(task_w)
+            self.result_conns.append(result_r)
             self.workers.append(p)
-    
+
     def _stop_workers(self) -> None:
         """Stop all worker processes."""
-        for _ in range(self.num_workers):
-            self.task_queue.put(None)
+        for conn in self.task_conns:
+            try:
+                conn.send_bytes(TASK_HEADER.pack(0))  # Poison pill
+            except (BrokenPipeError, OSError):
+                pass  # Worker already gone
         for p in self.workers:
             p.join(timeout=2.0)
             if p.is_alive():
@@ -546,97 +993,131 @@ class Expedition:
     def _get_next_task(self) -> Optional[Tuple[int, int, int]]:
         """
         Get next (n, start, end) task to assign.
-        
+
         Priority:
-        1. Re-dispatch orphaned ranges (from resume) - first in pending_ranges
-        2. Assign new work from next_offset
+        1. Re-dispatch orphaned ranges (resume / dead worker), oldest
+           first since they're closest to completed_up_to
+        2. Pop the active search with the lowest next_offset from the
+           heap and assign a fresh batch
+
+        Both paths are O(log k) in the number of active searches; the
+        old linear scan over start_n..end_n re-checked every finished n
+        on every single dispatch.
         """
         batch_size = self.batch_sizer.get_batch_size()
-        
-        for n in range(self.start_n, self.end_n + 1):
-            if n in self.state.results:
-                continue  # Already found
-            
+
+        # Priority 1: orphaned ranges
+        while self._orphans:
+            n, start, end = self._orphans.popleft()
             search = self.state.searches[n]
-            if search.completed:
-                continue
-            
-            # Check if we have a candidate and all prior offsets assigned
-            if search.best_candidate is not None:
-                if search.next_offset >= search.best_candidate:
-                    # All new ranges assigned - but check for orphaned ranges
-                    if not search.pending_ranges:
-                        continue  # Nothing to dispatch
-            
-            # Priority 1: Re-dispatch orphaned ranges from previous run
-            # These are ranges that were in-flight when process died
-            # We pop from front (oldest first) since they're closer to completed_up_to
-            if search.pending_ranges:
-                # Check if this is an orphaned range (no worker assigned to it)
-                orphan = self._find_orphaned_range(n, search.pending_ranges)
-                if orphan:
-                    return (n, orphan[0], orphan[1])
-            
-            # Priority 2: Assign new batch from next_offset
-            if search.best_candidate is not None:
-                if search.next_offset >= search.best_candidate:
-                    continue  # All necessary ranges assigned
-            
+            if n in self.state.results or search.completed:
+                continue  # Finished while orphaned
+            idx = bisect.bisect_left(search.pending_ranges, (start, end))
+            if (idx >= len(search.pending_ranges)
+                    or search.pending_ranges[idx] != (start, end)):
+                continue  # Already accounted for
+            return (n, start, end)
+
+        # Priority 2: fresh batch from the most promising search
+        while self._active_heap:
+            next_offset, n = heapq.heappop(self._active_heap)
+            search = self.state.searches[n]
+            if n in self.state.results or search.completed:
+                continue  # Stale entry, drop
+            if next_offset != search.next_offset:
+                continue  # Superseded entry, the live one is elsewhere
+            if (search.best_candidate is not None
+                    and search.next_offset >= search.best_candidate):
+                continue  # Everything below the candidate is assigned
+
             start = search.next_offset
             end = start + batch_size
             search.next_offset = end
-            
-            # Track this range as in-flight
-            search.pending_ranges.append((start, end))
-            
+            # Fresh ranges arrive in increasing start order, so this is
+            # an append; insort defends the sorted invariant regardless
+            bisect.insort(search.pending_ranges, (start, end))
+            heapq.heappush(self._active_heap, (end, n))
             return (n, start, end)
-        
-        return None
-    
-    def _find_orphaned_range(
-        self, n: int, pending_ranges: List[Tuple[int, int]]
-    ) -> Optional[Tuple[int, int]]:
-        """
-        Find a pending range that has no worker assigned to it.
-        These are orphaned from a previous run and need re-dispatch.
-        """
-        # Get all ranges currently assigned to workers
-        worker_ranges: set[Tuple[int, int]] = set()
-        for task in self.worker_tasks.values():
-            if task is not None and task.n == n:
-                worker_ranges.add((task.start_offset, task.end_offset))
-        
-        # Find first pending range not in worker_ranges
-        for r in pending_ranges:
-            if r not in worker_ranges:
-                return r
-        
+
         return None
     
     def _dispatch_tasks(self) -> int:
         """Dispatch tasks to idle workers. Returns number dispatched."""
         dispatched = 0
-        
+
         for worker_id in range(self.num_workers):
-            if self.worker_tasks[worker_id] is not None:
+            if worker_id in self._dead_workers:
+                continue  # Pipe is gone, nothing to send to
+            if self.worker_tasks[worker_id]:
                 continue  # Worker busy
-            
-            task = self._get_next_task()
-            if task is None:
-                break  # No more work
-            
-            n, start, end = task
-            self.task_queue.put((worker_id, n, start, end))
-            self.worker_tasks[worker_id] = WorkerTask(
+
+            # Coalesce several small batches into one task message so a
+            # fast batch doesn't cost a pipe round-trip of its own
+            batch_size = self.batch_sizer.get_batch_size()
+            max_ranges = max(1, CHUNK_TARGET // batch_size)
+            entries: List[Tuple[int, int, int]] = []
+            while len(entries) < max_ranges:
+                task = self._get_next_task()
+                if task is None:
+                    break
+                entries.append(task)
+
+            if not entries:
+                # No fresh work: put idle hands on a straggler instead
+                if self._steal_task(worker_id):
+                    dispatched += 1
+                continue
+
+            self._send_chunk(worker_id, entries)
+            dispatched += 1
+
+        return dispatched
+
+    def _send_chunk(
+        self, worker_id: int, entries: List[Tuple[int, int, int]]
+    ) -> None:
+        """Send a chunk of (n, start, end) entries as one task message."""
+        msg = bytearray(TASK_HEADER.pack(len(entries)))
+        now = time.time()
+        for n, start, end in entries:
+            msg += TASK_FRAME.pack(n, start, end)
+            self.worker_tasks[worker_id].append(WorkerTask(
                 worker_id=worker_id,
                 n=n,
                 start_offset=start,
                 end_offset=end,
-                assigned_at=time.time(),
+                assigned_at=now,
+            ))
+        self.task_conns[worker_id].send_bytes(bytes(msg))
+
+    def _steal_task(self, worker_id: int) -> bool:
+        """
+        Re-dispatch a straggling in-flight batch to an idle worker.
+
+        Near the end of a search every remaining batch is already
+        assigned, so without this the first workers to finish sit idle
+        behind the slowest one. A frame already sent down a pipe can't
+        be retracted, so instead the oldest in-flight batch is run
+        speculatively by the idle worker; whichever copy finishes first
+        wins and the loser's duplicate result is ignored harmlessly.
+        """
+        in_flight = [
+            t for tasks in self.worker_tasks for t in tasks
+            if t.n not in self.state.results
+        ]
+        # Oldest in-flight batch that isn't already duplicated
+        for victim in sorted(in_flight, key=lambda t: t.assigned_at):
+            copies = sum(
+                1 for t in in_flight
+                if t.n == victim.n and t.start_offset == victim.start_offset
             )
-            dispatched += 1
-        
-        return dispatched
+            if copies == 1:
+                self._send_chunk(
+                    worker_id,
+                    [(victim.n, victim.start_offset, victim.end_offset)],
+                )
+                return True
+        return False
     
     def _process_result(
         self,
@@ -650,61 +1131,61 @@ class Expedition:
         """Process a result from a worker."""
         # Record batch timing
         self.batch_sizer.record_batch(elapsed, end - start)
-        
-        # Free worker
-        self.worker_tasks[worker_id] = None
-        
+
+        # Retire this batch from the worker's chunk
+        self.worker_tasks[worker_id] = [
+            t for t in self.worker_tasks[worker_id]
+            if not (t.n == n and t.start_offset == start)
+        ]
+
         # Skip if already finalized
         if n in self.state.results:
             return
-        
-        search = self.state.searches[n]
-        
-        # Remove this range from pending
-        try:
-            search.pending_ranges.remove((start, end))
-        except ValueError:
-            pass  # Range not found (shouldn't happen)
-        
-        # Update completed_up_to: advance it while there are no gaps
-        # Sort pending ranges and find the lowest start
-        if not search.pending_ranges:
-            # No pending ranges, completed_up_to = next_offset
-            search.completed_up_to = search.next_offset
-        else:
-            # completed_up_to = min start of pending ranges
-            min_pending_start = min(r[0] for r in search.pending_ranges)
-            search.completed_up_to = min_pending_start
-        
+
+        # Workers report BPSW probable primes; confirm with a 50-round
+        # Miller-Rabin pass before letting the hit steer the search.
+        # Runs at most once per reported prime, so the cost is noise.
         if found_m is not None:
-            # Found a prime! Update best candidate if better
-            if search.best_candidate is None or found_m < search.best_candidate:
-                search.best_candidate = found_m
-        
-        # Check if search is complete:
-        # Have a candidate AND all offsets up to that candidate have COMPLETED
-        if search.best_candidate is not None:
-            if search.completed_up_to >= search.best_candidate:
-                self._finalize_result(n, search.best_candidate, worker_id)
-                return  # Already saved in _finalize_result
-        
-        # Live bookkeeping: save after every batch for power-loss recovery
-        self._save_checkpoint()
-    
+            if not gmpy2.is_prime(_get_primorial(n) + found_m, 50):
+                print(f"Warning: rejected pseudoprime at F({n}) offset {found_m}")
+                # The worker stopped scanning at the BPSW hit, so only
+                # [start, found_m] was actually tested. Absorb just that
+                # prefix and re-dispatch the untested remainder as an
+                # orphan; marking the whole batch searched would silently
+                # skip (found_m, end) and could finalize a wrong F(n).
+                search = self.state.searches[n]
+                idx = bisect.bisect_left(search.pending_ranges, (start, end))
+                if (idx < len(search.pending_ranges)
+                        and search.pending_ranges[idx] == (start, end)
+                        and found_m + 1 < end):
+                    search.pending_ranges[idx] = (found_m + 1, end)
+                    self._orphans.append((n, found_m + 1, end))
+                end = found_m + 1
+                found_m = None
+
+        # Keep total_elapsed live so a finalization stamps the right time
+        self.state.total_elapsed = (
+            self.baseline_elapsed + (time.time() - self.start_time)
+        )
+
+        finalized = apply_batch_result(self.state, n, start, end, found_m)
+
+        # Journal the outcome; a full snapshot per batch serialized the
+        # entire state on every result, which dwarfed fast batches
+        self.checkpoint_mgr.append_event(n, start, end, found_m)
+        self._events_since_snapshot += 1
+
+        if finalized:
+            self._finalize_result(n, self.state.results[n], worker_id)
+        elif (self._events_since_snapshot >= JOURNAL_SNAPSHOT_EVENTS
+                or time.time() - self._last_snapshot >= JOURNAL_SNAPSHOT_SECS):
+            self._save_checkpoint()
+
     def _finalize_result(self, n: int, f_n: int, worker_id: int) -> None:
-        """Finalize and record a result."""
-        search = self.state.searches[n]
-        search.completed = True
-        search.pending_ranges = []  # Clean up stale metadata
-        search.completed_up_to = search.next_offset  # Mark all as done
-        self.state.results[n] = f_n
-        
-        # Total elapsed: baseline from checkpoint + current session time
-        elapsed = self.baseline_elapsed + (time.time() - self.start_time)
-        self.state.result_times[n] = elapsed
-        
+        """Report a finalized result and snapshot."""
+        elapsed = self.state.result_times[n]
         remaining = (self.end_n - self.start_n + 1) - len(self.state.results)
-        
+
         # Log to markdown table
         if self.logger:
             self.logger.log_row(
@@ -714,14 +1195,14 @@ class Expedition:
                 worker_tasks=self.worker_tasks,
                 finished_worker=worker_id,
             )
-        
+
         print(
             f"F({n}) = {f_n:6d} | "
             f"batch={self.batch_sizer.get_batch_size():4d} | "
             f"elapsed={format_duration(elapsed)} | "
             f"remaining={remaining}"
         )
-        
+
         # Save checkpoint
         self._save_checkpoint()
     
@@ -732,6 +1213,10 @@ class Expedition:
         # Compute total elapsed: baseline from checkpoint + current session time
         self.state.total_elapsed = self.baseline_elapsed + (time.time() - self.start_time)
         self.checkpoint_mgr.save(self.state)
+        self._events_since_snapshot = 0
+        self._last_snapshot = time.time()
+        if self.logger:
+            self.logger.flush()
     
     def _all_complete(self) -> bool:
         """Check if all computations are complete."""
@@ -739,7 +1224,7 @@ class Expedition:
     
     def _any_workers_busy(self) -> bool:
         """Check if any workers are still working."""
-        return any(t is not None for t in self.worker_tasks.values())
+        return any(self.worker_tasks)
     
     def run(self) -> Dict[int, int]:
         """Run the expedition. Returns results dict."""
@@ -756,17 +1241,47 @@ class Expedition:
             
             # Main loop
             while not self._all_complete() and not self.shutdown_requested:
-                try:
-                    result = self.result_queue.get(timeout=0.5)
-                    self._process_result(*result)
+                live_conns = [
+                    c for i, c in enumerate(self.result_conns)
+                    if i not in self._dead_workers
+                ]
+                if not live_conns:
+                    print("All workers died; saving checkpoint")
+                    break
+                # Block until a result or a signal; no polling timeout
+                ready = connection_wait(live_conns + [self._wakeup_r])
+                for conn in ready:
+                    if conn is self._wakeup_r:
+                        conn.recv_bytes()  # Drain; loop condition exits
+                        continue
+                    try:
+                        frame = conn.recv_bytes()
+                    except (EOFError, OSError):
+                        # Dead worker: orphan its in-flight range so it
+                        # gets re-dispatched ahead of fresh work
+                        wid = self.result_conns.index(conn)
+                        self._dead_workers.add(wid)
+                        if self.worker_tasks[wid]:
+                            for task in self.worker_tasks[wid]:
+                                self._orphans.append(
+                                    (task.n, task.start_offset, task.end_offset)
+                                )
+                            self.worker_tasks[wid] = []
+                            self._dispatch_tasks()
+                        continue
+                    wid, n, start, end, found_m, elapsed = RESULT_FRAME.unpack(frame)
+                    self._process_result(
+                        wid, n, start, end,
+                        None if found_m == NO_PRIME else found_m,
+                        elapsed,
+                    )
                     self._dispatch_tasks()
-                except Exception:
-                    continue
             
             # No drain on shutdown - pending_ranges will be re-dispatched on resume
         
         finally:
             self._save_checkpoint()
+            self.checkpoint_mgr.flush()
             self._stop_workers()
             
             # Finalize markdown log
@@ -15,7 +15,10 @@ References:
 """
 
 import gmpy2
+import primes
+from sieve_candidates import filter_batch
 from multiprocessing import Process, Queue, cpu_count
+from queue import Empty, Full
 from typing import Tuple, Optional, Dict, List
 import sys
 import time
@@ -38,36 +41,49 @@ def format_duration(seconds: float) -> str:
 def compute_primorial_oeis(n: int) -> int:
     """
     Compute primorial(n) = product of first n primes (OEIS A005235 definition).
+
+    Delegates to the shared sieve-backed helpers; the old next_prime
+    left-fold restarted from 2 on every call.
     """
-    if n == 0:
-        return 1
-    result = 1
-    p = 2
-    for _ in range(n):
-        result *= p
-        p = int(gmpy2.next_prime(p))
-    return result
+    return primes.primorial(n)
 
 
 def compute_nth_prime(n: int) -> int:
     """Get the nth prime (1-indexed)."""
-    p = 2
-    for _ in range(n - 1):
-        p = int(gmpy2.next_prime(p))
-    return p
+    return primes.nth_prime(n)
+
+
+# Offsets per wheel-prefiltered window in compute_fortunate
+SEARCH_WINDOW = 10_000
+SEARCH_LIMIT = 1_000_000
 
 
 def compute_fortunate(n: int) -> int:
     """
     Find Fortunate number F(n) = smallest m > 1 where primorial(n) + m is prime.
+
+    Offsets sharing a prime factor <= p_n with the primorial are
+    rejected by the wheel prefilter before is_prime sees them - that's
+    most of the range, and each avoided call is Miller-Rabin on a
+    number with thousands of digits. Passing pn additionally trial-
+    divides survivors by primes above p_n using cached residues of
+    pn mod q, so only candidates with no small factor at all reach the
+    full primality test.
     """
     pn = compute_primorial_oeis(n)
     p_n_plus_1 = compute_nth_prime(n + 1)
-    
-    for offset in range(p_n_plus_1, 1000000):
-        if gmpy2.is_prime(pn + offset, 25):
-            return offset
-    
+    pn_z = gmpy2.mpz(pn)  # keep the hot loop's add inside GMP
+
+    for lo in range(p_n_plus_1, SEARCH_LIMIT, SEARCH_WINDOW):
+        hi = min(lo + SEARCH_WINDOW, SEARCH_LIMIT)
+        for offset in filter_batch(lo, hi, n, pn):
+            # Cheap 2-round scan; almost everything here is composite
+            # and falls in round one. The rare survivor gets a 50-round
+            # confirmation so the reported value stays strong.
+            if gmpy2.is_prime(pn_z + offset, 2):
+                if gmpy2.is_prime(pn_z + offset, 50):
+                    return offset
+
     raise RuntimeError(f"No Fortunate number found for F({n}) within 1M search range")
 
 
@@ -212,12 +228,17 @@ def compute_fortunates(
     # Pending work
     pending: List[int] = list(range(start_n, end_n + 1))
     
+    # Warm the shared prime cache before forking: workers inherit the
+    # sieved primes copy-on-write, so none of them re-sieves and each
+    # primorial build is a single native GMP call over cached primes.
+    primes.first_n_primes(end_n + 1)
+
     # Open markdown file if specified
     md_file = None
     if md_path:
         md_file = open(md_path, 'w')
         write_md_header(md_file, start_n, end_n, num_workers)
-    
+
     # Start workers
     workers: List[Process] = []
     for worker_id in range(num_workers):
@@ -244,7 +265,11 @@ def compute_fortunates(
     
     while len(results) < total_tasks:
         try:
-            worker_id, n, f_n, elapsed = result_queue.get(timeout=0.5)
+            # Long timeout: nothing in this loop needs polling, it only
+            # wakes for results. Catch Empty specifically - a worker
+            # crash used to vanish into the old bare except and leave
+            # the loop spinning on a queue that would never fill.
+            worker_id, n, f_n, elapsed = result_queue.get(timeout=2.0)
             results[n] = (f_n, elapsed)
             
             # Assign next task to this worker (BEFORE updating state for print)
@@ -272,7 +297,7 @@ def compute_fortunates(
             if md_file:
                 write_md_row(md_file, elapsed_str, assignments, num_workers, worker_id, result_str)
             
-        except:
+        except Empty:
             continue
     
     total_time = time.time() - start_time
@@ -287,7 +312,7 @@ def compute_fortunates(
     for worker_id in range(num_workers):
         try:
             task_queues[worker_id].put(None, timeout=0.1)
-        except:
+        except Full:
             pass
     
     for p in workers:
@@ -0,0 +1,505 @@
+"""
+Fortunate Numbers Calculator - v2 streaming edition.
+
+Batch-parallel search for a single n: the main loop streams offset
+batches to a worker pool and adapts the batch size from completion-time
+feedback (target 60/num_workers seconds per batch, threshold factor
+tk=2.0, starting from 1). A result is only accepted once every offset
+below the candidate has been confirmed composite.
+
+Progress format (parsed by fabricate_checkpoint.py):
+    F(4601) W1 : [44221; ?] [44207+1] (22.59s) (22.61s)
+    ^n      ^worker  ^confirmed lower bound; candidate or ?
+                          ^batch just completed  ^batch time  ^elapsed
+
+Usage:
+    python fortunate_v2.py 500          # Compute F(500)
+    python fortunate_v2.py 500 510      # Compute F(500)..F(510)
+
+References:
+- OEIS A005235: https://oeis.org/A005235
+- CASE_STUDY_F1500.md: Firoozbakht bound F(n) >= p_{n+1}
+"""
+
+import gmpy2
+import primes
+from sieve_candidates import (
+    filter_batch, install_trial_residues, trial_residues, warm_prefilter,
+)
+from multiprocessing import Pipe, Process, Queue, cpu_count
+from multiprocessing.connection import Connection, wait as connection_wait
+from queue import Empty, Full
+from typing import Dict, List, Optional, Tuple
+import atexit
+import struct
+import sys
+import time
+
+
+# Result frame: (worker_id, n, batch_start, batch_end, found_m,
+# dispatch_time). Fixed-width struct over a pipe instead of a pickled
+# tuple on a Queue: no pickler, no feeder thread, one write per result.
+# The dispatch timestamp rides along with the batch, so the main loop
+# keeps no per-batch bookkeeping at all.
+RESULT_FRAME = struct.Struct("<iiqqqd")
+NO_PRIME = -1  # found_m sentinel for a batch with no prime
+
+
+# =============================================================================
+# Helper Functions
+# =============================================================================
+
+def format_duration(seconds: float) -> str:
+    """Format duration as human-readable string."""
+    if seconds < 1.0:
+        return f"{seconds * 1000:.0f}ms"
+    elif seconds < 60.0:
+        return f"{seconds:.2f}s"
+    else:
+        return f"{seconds / 60.0:.2f}m"
+
+
+def compute_nth_prime(n: int) -> int:
+    """
+    Get the nth prime (1-indexed).
+
+    Delegates to the shared sieve-backed helpers; the old next_prime
+    walk paid a primality test per step, repeated in every process
+    that needed p_{n+1} or a primorial.
+    """
+    return primes.nth_prime(n)
+
+
+def compute_min_offset(n: int) -> int:
+    """
+    Smallest offset worth testing: p_{n+1}.
+
+    Every m < p_{n+1} shares a prime factor with primorial(n), so
+    primorial(n) + m is trivially composite (Firoozbakht, 2003 - see
+    CASE_STUDY_F1500.md for the rediscovery).
+    """
+    return compute_nth_prime(n + 1)
+
+
+def compute_primorial(n: int) -> int:
+    """
+    Compute primorial(n) = product of first n primes.
+
+    Delegates to primes.primorial (GMP's native subproduct tree): the
+    old left-fold multiplied an ever-growing accumulator by one tiny
+    prime per step, O(n^2) bit operations where the balanced tree keeps
+    operand sizes matched and lets GMP's subquadratic multiplication
+    apply.
+    """
+    return primes.primorial(n)
+
+
+# =============================================================================
+# Worker Process
+# =============================================================================
+
+# Primorials keyed by n. The orchestrator warms this BEFORE forking
+# workers, so under fork every worker reads the parent's bignum
+# copy-on-write: one build and one physical copy for the whole pool,
+# instead of one O(n) rebuild per process. The in-worker fallback only
+# runs if a task arrives for an n nobody warmed.
+_pn_cache: Dict[int, int] = {}
+
+# Same primorials as mpz, warmed alongside _pn_cache: the hot loop's
+# `pn_z + m` then stays entirely inside GMP, instead of a CPython
+# bignum add plus a full int->mpz conversion per candidate.
+_pn_z_cache: Dict[int, "gmpy2.mpz"] = {}
+
+def test_batch(
+    n: int, start: int, batch_size: int, pn: int, pn_z: "gmpy2.mpz"
+) -> Tuple[int, int, Optional[int]]:
+    """
+    Test offsets [start, start + batch_size) against a precomputed pn.
+
+    The wheel prefilter rejects offsets sharing a prime factor <= p_n
+    with the primorial, and passing pn sieves survivors by primes above
+    p_n via cached residues of pn mod q - all byte-level work on m, so
+    most of the batch never reaches the 25-round Miller-Rabin test on a
+    number with thousands of digits.
+
+    `pn_z + m` allocates a fresh mpz per candidate, but with pn_z
+    already an mpz the add is a straight GMP limb copy (~0.2us at
+    n=2000) against a primality test over five orders of magnitude
+    slower; an in-place xmpz accumulator measured no faster, so the
+    allocation stays.
+
+    Returns (start, end, m) where m is the first offset making pn + m
+    prime, or (start, end, None) if the batch holds no prime.
+    """
+    end = start + batch_size
+    for m in filter_batch(start, end, n, pn):
+        # Cheap 2-round scan first: gmpy2's is_prime already layers
+        # trial division and Miller-Rabin BPSW-style, and almost every
+        # survivor of the prefilter is composite and fails round one.
+        # The rare hit gets a 25-round confirmation so the candidate
+        # reported upward keeps the same confidence as before.
+        if gmpy2.is_prime(pn_z + m, 2):
+            if gmpy2.is_prime(pn_z + m, 25):
+                return (start, end, m)
+    return (start, end, None)
+
+
+def worker(worker_id: int, work_queue: Queue, result_conn: Connection) -> None:
+    """
+    Worker process: pulls (n, start, size) batches, reports results.
+
+    The primorial arrives once per n via an init broadcast and lives in
+    _pn_cache for the life of the process - n is constant within a run,
+    so no worker ever builds it. With adaptive sizing starting at
+    batch_size=1, a per-batch rebuild used to dominate wall time.
+    """
+    while True:
+        try:
+            # Block outright: the 0.1s poll woke every worker 10x/s for
+            # nothing. Shutdown arrives as a poison pill either way.
+            # Anything other than Empty is a real bug and should kill
+            # the worker loudly, not be swallowed by a bare except - the
+            # orchestrator drops the dead pipe on EOF.
+            args = work_queue.get()
+        except Empty:
+            continue
+        if args is None:  # Poison pill
+            break
+        if args[0] == "init":
+            # Primorial + trial-residue broadcast for a new n: store
+            # and move on. Idempotent, so consuming a second copy is
+            # harmless.
+            _, n, pn, residues = args
+            _pn_cache[n] = pn
+            _pn_z_cache[n] = gmpy2.mpz(pn)
+            install_trial_residues(n, residues)
+            continue
+        n, start, size, dispatched = args
+        pn = _pn_cache.get(n)
+        if pn is None:
+            # Missed the broadcast (e.g. another worker drained it
+            # while this one finished a straggler); build locally.
+            pn = _pn_cache[n] = compute_primorial(n)
+        pn_z = _pn_z_cache.get(n)
+        if pn_z is None:
+            pn_z = _pn_z_cache[n] = gmpy2.mpz(pn)
+        # n is echoed back so the orchestrator can drop stragglers
+        # from a previous search on the shared pool
+        batch_start, batch_end, found = test_batch(n, start, size, pn, pn_z)
+        try:
+            result_conn.send_bytes(RESULT_FRAME.pack(
+                worker_id, n, batch_start, batch_end,
+                NO_PRIME if found is None else found, dispatched,
+            ))
+        except BrokenPipeError:
+            break  # Orchestrator is gone; nothing left to report to
+
+
+# =============================================================================
+# Persistent Worker Pool
+# =============================================================================
+
+# Workers and queues outlive individual fortunate_streaming calls: for
+# small n the fork + interpreter + gmpy2 startup cost dominated each
+# call, so a range run paid it over and over. The pool is created
+# lazily on first use and torn down at interpreter exit.
+_pool_workers: List[Process] = []
+_pool_work_queue: Optional[Queue] = None
+_pool_result_conns: List[Connection] = []
+
+
+def _ensure_pool(num_workers: int) -> Tuple[Queue, List[Connection]]:
+    """Start the shared worker pool if it isn't running yet."""
+    global _pool_work_queue
+    if not _pool_workers:
+        _pool_work_queue = Queue(maxsize=num_workers * 2)
+        for worker_id in range(num_workers):
+            result_r, result_w = Pipe(duplex=False)
+            p = Process(
+                target=worker,
+                args=(worker_id, _pool_work_queue, result_w),
+                daemon=True,
+            )
+            p.start()
+            result_w.close()  # Parent keeps the read end only
+            _pool_result_conns.append(result_r)
+            _pool_workers.append(p)
+        atexit.register(shutdown_pool)
+    return _pool_work_queue, _pool_result_conns
+
+
+def shutdown_pool() -> None:
+    """Stop the shared workers (normally via atexit)."""
+    for _ in _pool_workers:
+        try:
+            _pool_work_queue.put_nowait(None)  # Poison pills
+        except Full:
+            pass  # Queue jammed; the terminate fallback below applies
+    for p in _pool_workers:
+        p.join(timeout=1.0)
+        if p.is_alive():
+            p.terminate()
+    for conn in _pool_result_conns:
+        conn.close()
+    _pool_workers.clear()
+    _pool_result_conns.clear()
+
+
+# =============================================================================
+# Search State (main loop's view of one F(n) search)
+# =============================================================================
+
+class SearchState:
+    """Tracks dispatched batches, completed ranges and the candidate."""
+
+    def __init__(self, n: int, min_offset: int, num_workers: int):
+        self.n = n
+        self.min_offset = min_offset
+        self.next_offset = min_offset
+        self.batch_size = 1  # Adaptive: grows/shrinks toward target_time
+        self.target_time = 60.0 / num_workers
+        self.tk = 2.0  # Accepted range is [target/tk, target*tk]
+        self.in_flight = 0
+        # Confirmed-composite watermark, maintained incrementally:
+        # everything in [min_offset, _lower) is done; finished batches
+        # above the watermark wait in _pending (start -> end) until the
+        # gap below them closes.
+        self._lower = min_offset
+        self._pending: Dict[int, int] = {}
+        self.best_candidate: Optional[int] = None
+
+    def dispatch(self, queue: Queue) -> bool:
+        """Put the next batch on the work queue; False if it's full."""
+        size = self.batch_size
+        if self.best_candidate is not None:
+            # Nothing at or above the candidate matters (it's already
+            # confirmed prime); don't let a grown batch sail past it and
+            # test offsets that can't win.
+            size = min(size, self.best_candidate - self.next_offset)
+            if size <= 0:
+                return False
+        try:
+            # put_nowait: on a full queue the old 10ms timed put parked
+            # the dispatch loop in the feeder's lock before giving the
+            # same answer. The caller retries after draining a result.
+            # The dispatch timestamp travels with the batch and comes
+            # back in the result frame, so there's no start->time dict
+            # to insert into here and pop on every result.
+            queue.put_nowait((self.n, self.next_offset, size, time.time()))
+            self.next_offset += size
+            self.in_flight += 1
+            return True
+        except Full:
+            return False
+
+    def should_dispatch(self) -> bool:
+        """More work to hand out? Only offsets below the candidate count."""
+        return self.best_candidate is None or self.next_offset < self.best_candidate
+
+    def record_result(
+        self,
+        batch_start: int,
+        batch_end: int,
+        result: Optional[int],
+        dispatch_time: float,
+    ) -> float:
+        """Fold one batch outcome into the state; returns its batch time."""
+        self.in_flight -= 1
+
+        # Both timestamps are taken in this process; the dispatch one
+        # merely round-tripped through the worker.
+        completion_time = time.time() - dispatch_time
+
+        if result is not None:
+            if self.best_candidate is None or result < self.best_candidate:
+                self.best_candidate = result
+            # Offsets below the hit were tested composite on the way
+            self._absorb(batch_start, result)
+        else:
+            self._absorb(batch_start, batch_end)
+
+        return completion_time
+
+    def _absorb(self, start: int, end: int) -> None:
+        """Merge one finished range into the watermark, O(1) amortized."""
+        if start <= self._lower:
+            self._lower = max(self._lower, end)
+            # Pull in any parked segments the advance made contiguous
+            while self._lower in self._pending:
+                self._lower = self._pending.pop(self._lower)
+        else:
+            self._pending[start] = end
+
+    def adjust_batch_size(self, recent_size: int, completion_time: float) -> None:
+        """
+        Bidirectional adaptive sizing (see the adaptive-batch-sizing issue).
+
+        Grow when a batch at least as large as the current size finishes
+        well under target; shrink when a batch no larger than current
+        overshoots it. Anything within [target/tk, target*tk] is left be.
+
+        Growth is damped to 1.5x per step with an absolute cap: doubling
+        on every fast batch blew the size up 1 -> 2048 within ten
+        batches, and a batch that large overshoots the candidate, wasting
+        every test above it. Slower growth costs a few extra small
+        batches early; overshoot costs expensive primality tests late.
+        """
+        if completion_time < self.target_time / self.tk:
+            if recent_size >= self.batch_size:
+                self.batch_size = min(int(recent_size * 1.5) + 1,
+                                      recent_size + 512)
+        elif completion_time > self.target_time * self.tk:
+            if recent_size <= self.batch_size:
+                self.batch_size = max(1, int(recent_size / self.tk))
+
+    def compute_lower_bound(self) -> int:
+        """
+        Largest offset below which everything is confirmed composite.
+
+        Just reads the watermark - record_result maintains it, so the
+        old sort over every completed batch (O(k log k) per result,
+        quadratic over a long search) is gone.
+        """
+        return self._lower
+
+    def is_complete(self) -> bool:
+        """The candidate is F(n) once everything below it is confirmed."""
+        return (
+            self.best_candidate is not None
+            and self.compute_lower_bound() >= self.best_candidate
+        )
+
+
+# =============================================================================
+# Search Orchestration
+# =============================================================================
+
+def run_search(
+    state: SearchState,
+    work_queue: Queue,
+    result_conns: List[Connection],
+    num_workers: int,
+    start_time: float,
+    verbose: bool = True,
+) -> int:
+    """Drive one F(n) search to completion; returns F(n)."""
+    while True:
+        # Keep the pipeline full: up to 2 batches per worker in flight
+        while state.in_flight < num_workers * 2 and state.should_dispatch():
+            if not state.dispatch(work_queue):
+                break
+
+        # Block until a result arrives - nothing to do before one does,
+        # and the 0.1s poll burned wakeups and added tail latency. The
+        # dispatch loop above refills the pipeline after each drain.
+        for conn in connection_wait(result_conns):
+            try:
+                worker_id, res_n, batch_start, batch_end, result, dispatched = \
+                    RESULT_FRAME.unpack(conn.recv_bytes())
+            except (EOFError, OSError):
+                # Worker went away; drop its pipe or wait() would
+                # report the EOF again on every pass.
+                result_conns.remove(conn)
+                continue
+            if result == NO_PRIME:
+                result = None
+
+            if res_n != state.n:
+                continue  # Straggler from a previous search on the pool
+
+            completion_time = state.record_result(
+                batch_start, batch_end, result, dispatched)
+            state.adjust_batch_size(batch_end - batch_start, completion_time)
+
+            if verbose:
+                lower = state.compute_lower_bound()
+                upper = (state.best_candidate
+                         if state.best_candidate is not None else "?")
+                print(
+                    f"F({state.n}) W{worker_id + 1} : [{lower}; {upper}] "
+                    f"[{batch_start}+{batch_end - batch_start}] "
+                    f"({format_duration(completion_time)}) "
+                    f"({format_duration(time.time() - start_time)})"
+                )
+                sys.stdout.flush()
+
+            if state.is_complete():
+                return state.best_candidate
+
+
+def fortunate_streaming(
+    n: int,
+    num_workers: Optional[int] = None,
+    verbose: bool = True,
+) -> Tuple[int, float]:
+    """
+    Find Fortunate number F(n) = smallest m > 1 where primorial(n) + m
+    is prime. Returns (F(n), elapsed seconds).
+    """
+    if num_workers is None:
+        num_workers = cpu_count()
+
+    start_time = time.time()
+    min_offset = compute_min_offset(n)
+    state = SearchState(n, min_offset, num_workers)
+
+    # Pool first: on a cold start the workers' fork + interpreter +
+    # gmpy2 startup then runs concurrently with the primorial and
+    # residue builds below, instead of serializing the two phases.
+    work_queue, result_conns = _ensure_pool(num_workers)
+
+    # Build the primorial and the pn-mod-q residue table exactly once,
+    # in the parent, and broadcast them; workers idle on the queue
+    # until their init arrives.
+    if n not in _pn_cache:
+        _pn_cache[n] = compute_primorial(n)
+    if n not in _pn_z_cache:
+        _pn_z_cache[n] = gmpy2.mpz(_pn_cache[n])
+    warm_prefilter(n, _pn_cache[n])
+    residues = trial_residues(_pn_cache[n], n)
+    for _ in range(num_workers):
+        work_queue.put(("init", n, _pn_cache[n], residues))
+    f_n = run_search(state, work_queue, result_conns, num_workers,
+                     start_time, verbose)
+    return f_n, time.time() - start_time
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> None:
+    """Command-line interface."""
+    if len(sys.argv) < 2:
+        print("Usage: python fortunate_v2.py <start_n> [end_n]")
+        print("Example: python fortunate_v2.py 500")
+        print("         python fortunate_v2.py 500 510")
+        sys.exit(1)
+
+    start_n = int(sys.argv[1])
+    end_n = int(sys.argv[2]) if len(sys.argv) > 2 else start_n
+
+    print(f"Computing F({start_n})..F({end_n}) with {cpu_count()} workers")
+
+    total_start = time.time()
+    results: Dict[int, Tuple[int, float]] = {}
+    for n in range(start_n, end_n + 1):
+        f_n, elapsed = fortunate_streaming(n)
+        results[n] = (f_n, elapsed)
+        print(f"F({n}) = {f_n:>8} ({elapsed:>7.2f}s)")
+
+    if end_n > start_n:
+        total_time = time.time() - total_start
+        compute_time = sum(elapsed for _, elapsed in results.values())
+        print()
+        print("=" * 80)
+        print(f"Completed: {len(results)}/{end_n - start_n + 1} results")
+        print(f"Total wall time: {total_time:.2f}s ({total_time / 60:.2f}m)")
+        print(f"Sum of individual times: {compute_time:.2f}s "
+              f"({compute_time / 60:.2f}m)")
+        print(f"Average per F(n): {compute_time / len(results):.2f}s")
+        print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Fortunate Numbers Calculator - v3 queue-based edition.
+
+One task per n: workers pull primorial indices off a shared queue and
+compute whole F(n) values, so a range load-balances naturally (a slow
+F(n) occupies one worker while the others drain the rest). Output is
+minimal - one line per completed n:
+
+    F( 509) =   3673 ( 511ms) [50 remaining,  2.67s elapsed]
+
+Usage:
+    python fortunate_v3.py 500          # Compute F(500)
+    python fortunate_v3.py 500 510      # Compute F(500)..F(510)
+
+References:
+- OEIS A005235: https://oeis.org/A005235
+- Fortune's conjecture: All Fortunate numbers are prime
+"""
+
+import gmpy2
+import primes
+from sieve_candidates import filter_batch
+from multiprocessing import Process, Queue, cpu_count, get_context
+from multiprocessing.connection import Connection, wait as connection_wait
+from queue import Full
+from typing import Dict, List, Optional, Tuple
+import atexit
+import os
+import struct
+import sys
+import time
+
+
+# Fork explicitly: the pool's economics (copy-on-write prime cache,
+# cheap startup) assume it, and a library that sets the global start
+# method to spawn would silently cost a full interpreter + gmpy2 load
+# per worker. Fork doesn't exist on Windows; spawn is all there is.
+_mp = get_context("fork" if sys.platform != "win32" else "spawn")
+
+
+# Result frame: (n, f_n, elapsed). Fixed-width struct over a pipe
+# instead of a pickled tuple on a queue - no pickler, one write per
+# result, same shape v2 uses for its batch results.
+RESULT_FRAME = struct.Struct("<iqd")
+
+
+# =============================================================================
+# Helper Functions
+# =============================================================================
+
+def format_duration(seconds: float) -> str:
+    """Format duration as human-readable string."""
+    if seconds < 1.0:
+        return f"{seconds * 1000:.0f}ms"
+    elif seconds < 60.0:
+        return f"{seconds:.2f}s"
+    else:
+        return f"{seconds / 60.0:.2f}m"
+
+
+# Last primorial built in this process, as (n, primorial(n)). The
+# queue hands out roughly consecutive indices, so a worker's next task
+# usually needs the previous primorial adjusted by a few primes.
+_last_primorial: Optional[Tuple[int, "gmpy2.mpz"]] = None
+
+
+def compute_primorial(n: int) -> "gmpy2.mpz":
+    """
+    Compute primorial(n) = product of first n primes, as an mpz.
+
+    Derived incrementally when possible: primorial(n) is the previous
+    build times the primes in between - or exactly divided by them when
+    n moves backwards, as it does under largest-first dispatch - one
+    short multiply or divide instead of a from-scratch construction per
+    task. Kept as mpz so the adjustments and the hot loop's adds all
+    stay inside GMP, with one int->mpz conversion per fresh build
+    instead of per use.
+    """
+    global _last_primorial
+    if _last_primorial is not None:
+        last_n, last_pn = _last_primorial
+        if last_n == n:
+            return last_pn
+        if last_n < n:
+            pn = last_pn
+            for p in primes.first_n_primes(n)[last_n:]:
+                pn *= p
+        else:
+            divisor = 1
+            for p in primes.first_n_primes(last_n)[n:]:
+                divisor *= p
+            pn = last_pn // divisor  # exact: divisor divides last_pn
+        _last_primorial = (n, pn)
+        return pn
+    pn = gmpy2.mpz(primes.primorial(n))
+    _last_primorial = (n, pn)
+    return pn
+
+
+def compute_min_offset(n: int) -> int:
+    """
+    Smallest offset worth testing: p_{n+1}.
+
+    Every m < p_{n+1} shares a prime factor with primorial(n), so
+    primorial(n) + m is trivially composite (Firoozbakht, 2003 - see
+    CASE_STUDY_F1500.md for the rediscovery).
+    """
+    return primes.nth_prime(n + 1)
+
+
+# Search ceiling for a single F(n); no known Fortunate number comes close
+SEARCH_LIMIT = 1_000_000
+# Offsets per wheel-prefiltered window in compute_fortunate
+SEARCH_WINDOW = 10_000
+
+
+def compute_fortunate(n: int) -> int:
+    """
+    Find Fortunate number F(n) = smallest m > 1 where primorial(n) + m
+    is prime.
+
+    Offsets are run through the wheel prefilter window by window: any m
+    sharing a prime factor <= p_n with the primorial is rejected on m
+    alone, and passing pn trial-divides survivors by primes above p_n
+    via cached residues of pn mod q. Only candidates with no small
+    factor at all reach a primality test.
+    """
+    pn = compute_primorial(n)  # mpz: the hot loop's add stays in GMP
+
+    for lo in range(compute_min_offset(n), SEARCH_LIMIT, SEARCH_WINDOW):
+        hi = min(lo + SEARCH_WINDOW, SEARCH_LIMIT)
+        for offset in filter_batch(lo, hi, n, pn):
+            # BPSW scan: no composite is known to pass it, and it costs
+            # about as much as two Miller-Rabin rounds. The rare
+            # survivor still gets a 50-round confirmation - once per n
+            # - so the reported value keeps its belt and braces.
+            if gmpy2.is_bpsw_prp(pn + offset):
+                if gmpy2.is_prime(pn + offset, 50):
+                    return offset
+
+    raise RuntimeError(f"No Fortunate number found for F({n}) within 1M search range")
+
+
+# =============================================================================
+# Worker Process
+# =============================================================================
+
+def worker(
+    worker_id: int, work_queue: Queue, result_conn: Connection, stop
+) -> None:
+    """
+    Worker process: pulls indices n off the shared queue, computes F(n).
+
+    The shared queue is the load balancer - whichever worker is free
+    takes the next n, so a pathological index never blocks the range.
+    """
+    # Pin to one core so the scheduler doesn't migrate us mid-run: the
+    # working set (primorial limbs, wheel mask) stays in that core's
+    # cache across tasks.
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, {worker_id % cpu_count()})
+        except OSError:
+            pass  # restricted affinity mask; run unpinned
+
+    while True:
+        n = work_queue.get()  # Block until task received
+        if n is None:  # Poison pill
+            break
+        if stop.value:
+            # Shutdown raced a real task onto the queue; leave it. The
+            # flag also covers workers whose pill was lost to a full
+            # queue - they stop after the task in hand instead of
+            # being terminated mid-computation.
+            break
+
+        start = time.time()
+        f_n = compute_fortunate(n)
+        elapsed = time.time() - start
+
+        result_conn.send_bytes(RESULT_FRAME.pack(n, f_n, elapsed))
+
+
+# =============================================================================
+# Persistent Worker Pool
+# =============================================================================
+
+# Workers and queues outlive individual compute_fortunates calls: the
+# fork + interpreter + gmpy2 startup cost used to be paid per call,
+# which dominated small ranges (the test suite alone fires a dozen
+# calls). Created lazily on first use, torn down at interpreter exit.
+_pool_workers: List[Process] = []
+_pool_work_queue: Optional[Queue] = None
+_pool_result_conns: List[Connection] = []
+_pool_stop = None  # shared flag: set once at shutdown, workers poll it
+
+
+def _ensure_pool(num_workers: int) -> Tuple[Queue, List[Connection]]:
+    """Start the shared worker pool if it isn't running yet."""
+    global _pool_work_queue, _pool_stop
+    if not _pool_workers:
+        _pool_work_queue = _mp.Queue()
+        _pool_stop = _mp.Value("i", 0, lock=False)
+        for worker_id in range(num_workers):
+            result_r, result_w = _mp.Pipe(duplex=False)
+            p = _mp.Process(
+                target=worker,
+                args=(worker_id, _pool_work_queue, result_w, _pool_stop),
+                daemon=True,
+            )
+            p.start()
+            result_w.close()  # Parent keeps the read end only
+            _pool_result_conns.append(result_r)
+            _pool_workers.append(p)
+        atexit.register(shutdown_pool)
+    return _pool_work_queue, _pool_result_conns
+
+
+def shutdown_pool() -> None:
+    """Stop the shared workers (normally via atexit)."""
+    if _pool_stop is not None:
+        _pool_stop.value = 1
+    for _ in _pool_workers:
+        try:
+            _pool_work_queue.put_nowait(None)  # Pills wake blocked gets
+        except Full:
+            pass  # The stop flag covers whoever missed a pill
+    for p in _pool_workers:
+        # Cooperative stop only: a worker mid-task exits after finishing
+        # it, and daemon processes are reaped at interpreter exit anyway.
+        # terminate() used to risk killing one holding the queue lock.
+        p.join(timeout=1.0)
+    _pool_work_queue.cancel_join_thread()
+    for conn in _pool_result_conns:
+        conn.close()
+    _pool_workers.clear()
+    _pool_result_conns.clear()
+
+
+# =============================================================================
+# Range Orchestration
+# =============================================================================
+
+def compute_fortunates(
+    start_n: int,
+    end_n: int,
+    num_workers: Optional[int] = None,
+    verbose: bool = True,
+) -> Dict[int, Tuple[int, float]]:
+    """
+    Compute F(start_n) through F(end_n) in parallel.
+
+    Every index goes on the shared queue up front; workers drain it at
+    their own pace and the collector prints each result as it lands.
+    Returns {n: (F(n), elapsed seconds)}.
+    """
+    if num_workers is None:
+        num_workers = cpu_count()
+
+    start_time = time.time()
+
+    # Warm the shared prime cache before forking: workers inherit the
+    # sieved primes copy-on-write, so none of them re-sieves and each
+    # primorial build is a single native GMP call over cached primes.
+    # Only helps the pool's first call, but that's the one that forks.
+    primes.first_n_primes(end_n + 1)
+
+    work_queue, result_conns = _ensure_pool(num_workers)
+
+    # Largest n first: cost grows superlinearly in n, and a big index
+    # dispatched last would run alone at the end while the other
+    # workers sit idle. Started first, the small indices fill the gaps.
+    for n in range(end_n, start_n - 1, -1):
+        work_queue.put(n)
+
+    results: Dict[int, Tuple[int, float]] = {}
+    total_tasks = end_n - start_n + 1
+
+    while len(results) < total_tasks:
+        # Block outright: the 0.5s poll only added wakeups and tail
+        # latency. Every queued index produces exactly one result.
+        for conn in connection_wait(result_conns):
+            try:
+                n, f_n, elapsed = RESULT_FRAME.unpack(conn.recv_bytes())
+            except (EOFError, OSError):
+                # Worker went away; drop its pipe or wait() would
+                # report the EOF again on every pass.
+                result_conns.remove(conn)
+                continue
+            results[n] = (f_n, elapsed)
+
+            if verbose:
+                remaining = total_tasks - len(results)
+                print(
+                    f"F({n:>4}) = {f_n:>6} ({format_duration(elapsed):>6}) "
+                    f"[{remaining:>2} remaining, "
+                    f"{format_duration(time.time() - start_time):>6} elapsed]"
+                )
+                sys.stdout.flush()
+
+    return results
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> None:
+    """Command-line interface."""
+    if len(sys.argv) < 2:
+        print("Usage: python fortunate_v3.py <start_n> [end_n]")
+        print("Example: python fortunate_v3.py 500")
+        print("         python fortunate_v3.py 500 510")
+        sys.exit(1)
+
+    start_n = int(sys.argv[1])
+    end_n = int(sys.argv[2]) if len(sys.argv) > 2 else start_n
+
+    print(f"Computing F({start_n})..F({end_n}) with {cpu_count()} workers")
+    print()
+
+    total_start = time.time()
+    results = compute_fortunates(start_n, end_n)
+    total_time = time.time() - total_start
+
+    if end_n > start_n:
+        compute_time = sum(elapsed for _, elapsed in results.values())
+        print()
+        print("=" * 80)
+        print(f"Completed: {len(results)}/{end_n - start_n + 1} results")
+        print(f"Total wall time: {format_duration(total_time)} "
+              f"({total_time:.2f}s)")
+        print(f"Sum of individual times: {format_duration(compute_time)} "
+              f"({compute_time:.2f}s)")
+        print(f"Average per number: "
+              f"{format_duration(compute_time / len(results))}")
+        print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
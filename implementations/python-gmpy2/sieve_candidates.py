@@ -0,0 +1,167 @@
+"""
+Offset prefiltering for the Fortunate search hot loops.
+
+Any offset m sharing a prime factor q <= p_n with primorial(n) makes
+primorial(n) + m trivially composite, so those m can be rejected from
+int arithmetic on m alone. The per-candidate gcd call is replaced here
+by a precomputed residue mask modulo 30030 = 2*3*5*7*11*13: one byte
+lookup per candidate instead of a bignum-free-but-still-costly gcd.
+Survivors are then gcd-checked against the remaining wheel primes
+(17..97) in one pass.
+
+The wheel is capped at the first 25 primes (up to 97): primes beyond
+that add little rejection power, and only primes <= p_n may ever be
+used, so everything is clamped by n. By Mertens the surviving density
+is prod(1 - 1/p) over the wheel primes, about 21% for the full wheel,
+so roughly four in five offsets never reach a primality test.
+"""
+
+from math import gcd
+from typing import Dict, List, Optional, Tuple
+
+import primes
+
+
+# First 6 primes fold into the mask modulus; the rest of the wheel is
+# handled by gcd against their product.
+WHEEL_MASK_PRIMES = 6
+WHEEL_MOD = 30030  # 2*3*5*7*11*13
+WHEEL_PRIME_COUNT = 25
+
+# mask[r] == 1 iff r is coprime to 30030. Built once at import;
+# indexing a bytes object is a C-level operation.
+WHEEL_MASK = bytes(
+    1 if gcd(r, WHEEL_MOD) == 1 else 0 for r in range(WHEEL_MOD)
+)
+
+# Trial-division sieve over primes q > p_n: q does not divide
+# primorial(n), but pn mod q is a fixed small residue per n, so marking
+# multiples of q in a batch needs no bignum arithmetic at all.
+SIEVE_LIMIT = 1_000_000
+
+# Per-n wheels, clamped to primes <= p_n
+_head_wheels: Dict[int, int] = {}  # product of first min(n, 6) primes
+_tail_wheels: Dict[int, int] = {}  # product of primes 7..min(n, 25)
+
+# Per-n trial residues: [(q, pn mod q)] for primes p_n < q <= sieve depth
+_trial_residues: Dict[int, List[Tuple[int, int]]] = {}
+
+
+def _sieve_depth(n: int) -> int:
+    """
+    How far to trial-divide for a given n.
+
+    is_prime cost grows roughly quadratically with the candidate's
+    digits, so deep trial division only pays off for large n; scale the
+    bound with n^2 and cap at SIEVE_LIMIT.
+    """
+    return min(SIEVE_LIMIT, max(1_000, n * n))
+
+
+def _head_wheel(n: int) -> int:
+    """Product of the first min(n, 6) primes (for n below the mask size)."""
+    if n not in _head_wheels:
+        wheel = 1
+        for p in primes.first_n_primes(min(n, WHEEL_MASK_PRIMES)):
+            wheel *= p
+        _head_wheels[n] = wheel
+    return _head_wheels[n]
+
+
+def _tail_wheel(n: int) -> int:
+    """Product of wheel primes 7..min(n, 25) not covered by the mask."""
+    if n not in _tail_wheels:
+        wheel = 1
+        for p in primes.first_n_primes(min(n, WHEEL_PRIME_COUNT))[WHEEL_MASK_PRIMES:]:
+            wheel *= p
+        _tail_wheels[n] = wheel
+    return _tail_wheels[n]
+
+
+def _get_trial_residues(pn: int, n: int) -> List[Tuple[int, int]]:
+    """Residues pn mod q for primes p_n < q <= sieve depth, cached per n."""
+    if n not in _trial_residues:
+        p_n = primes.nth_prime(n) if n > 0 else 1
+        _trial_residues[n] = [
+            (q, pn % q)
+            for q in primes.primes_up_to(_sieve_depth(n))
+            if q > p_n
+        ]
+    return _trial_residues[n]
+
+
+def trial_residues(pn: int, n: int) -> List[Tuple[int, int]]:
+    """The trial sieve's (q, pn mod q) table for n, built if missing."""
+    return _get_trial_residues(pn, n)
+
+
+def install_trial_residues(n: int, residues: List[Tuple[int, int]]) -> None:
+    """
+    Seed the per-n residue cache with a table built elsewhere.
+
+    The bignum reductions only depend on n, so an orchestrator can
+    compute them once and broadcast instead of every worker reducing
+    the primorial mod each q itself.
+    """
+    _trial_residues[n] = residues
+
+
+def warm_prefilter(n: int, pn: int) -> None:
+    """
+    Populate every per-n table filter_batch would build lazily.
+
+    Called in the orchestrator before forking workers: the wheels,
+    trial residues and the underlying prime sieve are then inherited
+    copy-on-write, so no worker sieves to the trial depth or reduces
+    the primorial mod each q on its own.
+    """
+    if n < WHEEL_MASK_PRIMES:
+        _head_wheel(n)
+        return
+    _tail_wheel(n)
+    _get_trial_residues(pn, n)
+
+
+def filter_batch(
+    start: int, end: int, n: int, pn: Optional[int] = None
+) -> List[int]:
+    """
+    Offsets m in [start, end) that could make primorial(n) + m prime.
+
+    Everything rejected here is provably composite; survivors still need
+    a real primality test. The wheel handles factors <= p_n (they divide
+    primorial(n), so only m matters); when pn is given, primes above p_n
+    are sieved too, using the cached residue pn mod q: pn + m is
+    divisible by q iff (r + m) mod q == 0, marked with bytearray strides
+    and no bignum arithmetic in the batch loop.
+    """
+    if n < WHEEL_MASK_PRIMES:
+        # Mask modulus contains primes > p_n; fall back to a small gcd wheel
+        wheel = _head_wheel(n)
+        return [m for m in range(start, end) if gcd(m, wheel) == 1]
+
+    # One mod for the whole batch: slice the mask at the batch's wheel
+    # position (wrapping if the batch straddles a wheel boundary) so the
+    # per-candidate `m % 30030` disappears entirely — enumerate walks a
+    # C-level bytes window instead.
+    span = end - start
+    pos = start % WHEEL_MOD
+    window = WHEEL_MASK[pos:pos + span]
+    while len(window) < span:
+        window += WHEEL_MASK[:span - len(window)]
+    survivors = [start + i for i, alive in enumerate(window) if alive]
+
+    tail = _tail_wheel(n)
+    if tail > 1:
+        survivors = [m for m in survivors if gcd(m, tail) == 1]
+
+    if pn is not None:
+        span = end - start
+        composite = bytearray(span)
+        for q, r in _get_trial_residues(pn, n):
+            i0 = (-(r + start)) % q
+            if i0 < span:
+                composite[i0::q] = b"\x01" * ((span - i0 + q - 1) // q)
+        survivors = [m for m in survivors if not composite[m - start]]
+
+    return survivors
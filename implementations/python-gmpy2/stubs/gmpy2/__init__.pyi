@@ -57,6 +57,20 @@ def is_prime(n: IntLike, k: int = 25) -> bool:
     ...
 
 
+def is_bpsw_prp(n: IntLike) -> bool:
+    """
+    Baillie-PSW probable prime test (strong base-2 Fermat + strong Lucas).
+
+    Args:
+        n: The number to test for primality.
+
+    Returns:
+        True if n is a BPSW probable prime, False if definitely
+        composite. No composite passing BPSW is known.
+    """
+    ...
+
+
 def next_prime(n: IntLike) -> mpz:
     """
     Return the smallest prime greater than n.